@@ -11,32 +11,101 @@ Design goals:
 
 from __future__ import annotations
 
+import codecs
 import hashlib
-import json
+import html.entities
+import io
+import math
+import os
+import random
 import re
 import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
 
-import feedparser
+import msgspec
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dateutil import parser as dateparser
+from dateutil.tz import gettz
+from scipy.sparse import coo_matrix, csr_matrix, triu
+from scipy.sparse.csgraph import connected_components
 from xml.etree import ElementTree as ET
 
+try:
+    from lxml import etree as LET
+except ImportError:  # stdlib ElementTree is slower but good enough
+    LET = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # clean_html falls back to regex stripping
+    LexborHTMLParser = None
+
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT / "data"
 FEEDS_FILE = DATA_DIR / "feeds.json"
+# Conditional-GET state: url -> {etag, last_modified, max_items, version,
+# parsed_cache_path}. Parsed entries live under PARSE_CACHE_DIR, one file per
+# (url, max_items, body) seen. Both are local build state (git-ignored): they
+# only pay off where data/ survives between runs, not on a fresh checkout.
+HTTP_CACHE_FILE = DATA_DIR / "http_cache.json"
+PARSE_CACHE_DIR = DATA_DIR / ".cache" / "parse"
+# Bump whenever parsing or cleanup changes what ends up in a ParsedEntry (or
+# its shape), so snapshots written by an older build are not served again.
+PARSE_CACHE_VERSION = 2
 
 UA = (
     "yu-news-hub/1.0 (+https://github.com/; contact: your-email; "
     "purpose: personal RSS aggregation)"
 )
 
+# Feeds are fetched concurrently; the work is almost entirely network latency.
+FETCH_WORKERS = 16
+
 SESSION = requests.Session()
-SESSION.headers.update({"User-Agent": UA})
+SESSION.headers.update(
+    {
+        "User-Agent": UA,
+        "Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.8, */*;q=0.5",
+        "Accept-Encoding": "gzip, deflate",
+    }
+)
+# Pool sized above FETCH_WORKERS so parallel fetches to one host (xinhuanet,
+# sec.gov, ...) keep their connections alive; transient 5xx are retried with
+# backoff instead of failing the feed.
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=["GET"],
+        # urllib3 sleeps for whatever Retry-After a 503 asks for, uncapped;
+        # one overloaded host must not park a worker for hours.
+        respect_retry_after_header=False,
+    ),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+HTTP_CACHE: Dict[str, Dict[str, Any]] = {}
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 
 def now_utc() -> datetime:
@@ -47,31 +116,95 @@ def sha1(s: str) -> str:
     return hashlib.sha1(s.encode("utf-8", errors="ignore")).hexdigest()
 
 
-TRACKING_PARAMS_RE = re.compile(r"^(utm_|spm|from|share|mkt_|mc_)", re.I)
+def itemid(feed_id: str, link: str) -> str:
+    # blake2b is faster than sha1 in software and a 12-byte digest keeps ids
+    # short in items.json; feeding the parts separately avoids building the
+    # joined string.
+    h = hashlib.blake2b(digest_size=12)
+    h.update(feed_id.encode("utf-8", errors="ignore"))
+    h.update(b"|")
+    h.update(link.encode("utf-8", errors="ignore"))
+    return h.hexdigest()
+
+
+TRACKING_PARAMS_RE = re.compile(r"^(utm_|spm|from|share|mkt_|mc_|mtm_)", re.I)
+# Exact keys that usually tag the referrer but are not always inert: TYPO3
+# rejects a link without its cHash and GitHub serves different content per
+# ?ref=. They are ignored when comparing links, never removed from them.
+DEDUPE_IGNORED_PARAMS_RE = re.compile(r"^(gclid|fbclid|yclid|igshid|chash|ref|ref_src)$", re.I)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+MULTI_SLASH_RE = re.compile(r"/{2,}")
 
 
 def canonicalize_url(url: str) -> str:
-    # Remove common tracking query params.
+    # Normalize the parts that never change which page is served: scheme/host
+    # case, default ports, duplicate slashes, query order, tracking params and
+    # the fragment. The result is still the link we show to readers.
     try:
-        from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
-
-        parts = urlsplit(url)
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = parts.hostname or ""
+        if ":" in host:
+            host = "[" + host + "]"
+        port = parts.port
+        netloc = host if port is None or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+        if "@" in parts.netloc:
+            netloc = parts.netloc.rsplit("@", 1)[0] + "@" + netloc
+        path = MULTI_SLASH_RE.sub("/", parts.path)
         q = [(k, v) for (k, v) in parse_qsl(parts.query, keep_blank_values=True)
              if not TRACKING_PARAMS_RE.match(k)]
+        q.sort(key=lambda kv: kv[0])
         new_query = urlencode(q, doseq=True)
-        return urlunsplit((parts.scheme, parts.netloc, parts.path, new_query, parts.fragment))
+        return urlunsplit((scheme, netloc, path, new_query, ""))
     except Exception:
         return url
 
 
-def parse_date(entry: Any) -> Optional[datetime]:
-    # feedparser may provide multiple date fields.
-    for key in ("published", "updated", "created", "pubDate"):
-        val = getattr(entry, key, None) if hasattr(entry, key) else entry.get(key)
+def url_key(link: str) -> str:
+    # Dedupe identity for an already canonical link. Dropping "www.", the
+    # trailing slash and referrer-ish params is only safe for comparison, not
+    # for the stored link: plenty of hosts do not serve (or redirect) the bare
+    # domain, and some need the params.
+    parts = urlsplit(link)
+    netloc = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    path = parts.path.rstrip("/") if len(parts.path) > 1 else parts.path
+    query = parts.query
+    if query:
+        query = urlencode([(k, v) for (k, v) in parse_qsl(query, keep_blank_values=True)
+                           if not DEDUPE_IGNORED_PARAMS_RE.match(k)], doseq=True)
+    return urlunsplit((parts.scheme, netloc, path, query, ""))
+
+
+# One reusable parser instance; dateutil.parser.parse() would rebuild its
+# lookup tables on every call. Abbreviations dateutil does not know are mapped
+# explicitly (US feeds like sec.gov / federalreserve.gov use them). "CST" is
+# left out on purpose: it means China Standard Time for half of our sources.
+DATE_PARSER = dateparser.parser(dateparser.parserinfo())
+TZINFOS = {
+    "EST": gettz("America/New_York"),
+    "EDT": gettz("America/New_York"),
+    "MST": gettz("America/Denver"),
+    "MDT": gettz("America/Denver"),
+    "PST": gettz("America/Los_Angeles"),
+    "PDT": gettz("America/Los_Angeles"),
+    "BST": gettz("Europe/London"),
+    "CET": gettz("Europe/Paris"),
+    "CEST": gettz("Europe/Paris"),
+}
+
+
+def parse_date(*values: Optional[str]) -> Optional[datetime]:
+    # Feeds may provide several date fields; use the first one that parses.
+    for val in values:
         if not val:
             continue
         try:
-            dt = dateparser.parse(val)
+            # ISO 8601 (Atom, sitemaps, dc:date) goes through the C parser;
+            # everything else (RFC 822 pubDate etc.) falls back to dateutil.
+            try:
+                dt = datetime.fromisoformat(val)
+            except ValueError:
+                dt = DATE_PARSER.parse(val, tzinfos=TZINFOS)
             if not dt:
                 continue
             if dt.tzinfo is None:
@@ -79,27 +212,38 @@ def parse_date(entry: Any) -> Optional[datetime]:
             return dt.astimezone(timezone.utc)
         except Exception:
             continue
-
-    # Some feeds expose structured time tuples.
-    for key in ("published_parsed", "updated_parsed"):
-        tp = getattr(entry, key, None) if hasattr(entry, key) else entry.get(key)
-        if tp:
-            try:
-                return datetime(*tp[:6], tzinfo=timezone.utc)
-            except Exception:
-                pass
     return None
 
 
+# Regex tag stripper: script/style blocks and plain tags in a single pass. Used
+# for titles, and for clean_html when selectolax is not installed.
+HTML_STRIP_RE = re.compile(r"<script[^>]*>.*?</script>|<style[^>]*>.*?</style>|<[^>]+>", re.S | re.I)
+WS_RE = re.compile(r"\s+")
+
+
+def normalize_title(title: str) -> str:
+    return WS_RE.sub(" ", title).strip().lower()
+
+
+def clean_text(text: str) -> str:
+    # Titles are plain text once the XML parser has decoded them, so a quoted
+    # "<script>" is a word in the headline, not markup. An HTML parser would
+    # treat it as a raw-text element and swallow the rest of the title.
+    if not text:
+        return ""
+    return WS_RE.sub(" ", HTML_STRIP_RE.sub(" ", text)).strip()
+
+
 def clean_html(text: str) -> str:
     if not text:
         return ""
-    # Very lightweight tag stripper.
-    text = re.sub(r"<script.*?>.*?</script>", "", text, flags=re.S | re.I)
-    text = re.sub(r"<style.*?>.*?</style>", "", text, flags=re.S | re.I)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    if LexborHTMLParser is not None:
+        # A real HTML parser (lexbor, in C): copes with broken markup and
+        # decodes entities, unlike the regex path.
+        tree = LexborHTMLParser(text)
+        tree.strip_tags(["script", "style"])
+        return " ".join(tree.text(separator=" ").split())
+    return clean_text(text)
 
 
 @dataclass
@@ -114,8 +258,97 @@ class FeedDef:
     weight: float
 
 
+class Item(msgspec.Struct, dict=True):
+    """
+    One entry of items.json. msgspec compiles an encoder for this fixed shape
+    and only encodes declared fields, so build-time caches (_dt, _url_key,
+    _title_norm, _sortkey) can live as plain attributes (dict=True) without
+    leaking into the output.
+    """
+
+    id: str
+    title: str
+    link: str
+    published: Optional[str]
+    source_id: str
+    source: str
+    region: str
+    lang: str
+    tags: List[str]
+    weight: float
+    summary: str
+
+
+class ParsedEntry(msgspec.Struct):
+    """
+    The part of an Item that comes from the feed body. Parse snapshots store
+    only this, so edits to feeds.json (name, region, tags, weight, ...) apply
+    to cached entries too.
+    """
+
+    title: str
+    link: str
+    published: Optional[str]
+    summary: str
+
+
+class Topic(msgspec.Struct):
+    id: str
+    headline: str
+    count: int
+    sources: List[str]
+    items: List[str]
+    score: float
+
+
+def feed_item(feed: FeedDef, entry: ParsedEntry, dt: Optional[datetime]) -> Item:
+    it = Item(
+        id=itemid(feed.id, entry.link),
+        title=entry.title,
+        link=entry.link,
+        published=entry.published,
+        source_id=feed.id,
+        source=feed.name,
+        region=feed.region,
+        lang=feed.lang,
+        tags=feed.tags,
+        weight=feed.weight,
+        summary=entry.summary,
+    )
+    return with_build_fields(it, dt)
+
+
+def with_build_fields(it: Item, dt: Optional[datetime]) -> Item:
+    it._dt = dt
+    it._url_key = url_key(it.link)
+    it._title_norm = normalize_title(it.title)
+    return it
+
+
+JSON_ENCODER = msgspec.json.Encoder()
+
+
+def write_json_array(path: Path, records: Iterable[msgspec.Struct]) -> None:
+    """
+    Writes `records` as a JSON array, one record per line, encoding each into
+    a reused buffer so the whole document is never held in memory. The file is
+    written next to `path` and renamed over it, so the frontend never sees a
+    half-written file.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    buf = bytearray()
+    with open(tmp, "wb") as f:
+        f.write(b"[")
+        for i, rec in enumerate(records):
+            f.write(b",\n" if i else b"\n")
+            JSON_ENCODER.encode_into(rec, buf)
+            f.write(buf)
+        f.write(b"\n]\n")
+    os.replace(tmp, path)
+
+
 def load_feeds() -> Tuple[Dict[str, Any], List[FeedDef]]:
-    cfg = json.loads(FEEDS_FILE.read_text(encoding="utf-8"))
+    cfg = orjson.loads(FEEDS_FILE.read_bytes())
     feeds: List[FeedDef] = []
     for f in cfg["feeds"]:
         feeds.append(
@@ -133,120 +366,353 @@ def load_feeds() -> Tuple[Dict[str, Any], List[FeedDef]]:
     return cfg, feeds
 
 
-def fetch_text(url: str, timeout: int = 20) -> str:
-    r = SESSION.get(url, timeout=timeout)
-    r.raise_for_status()
-    return r.text
+FEED_NS = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "rss1": "http://purl.org/rss/1.0/",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "content": "http://purl.org/rss/1.0/modules/content/",
+}
+
+FEED_ENTRY_TAGS = (
+    "item",
+    "{%s}item" % FEED_NS["rss1"],
+    "{%s}entry" % FEED_NS["atom"],
+)
+
+
+# Sloppy feeds are not well-formed around "&": HTML named entities (&nbsp;,
+# &mdash;) are undefined in XML, and bare ampersands ("S&P 500", "?a=1&b=2")
+# are not references at all. lxml's recover mode silently drops text around
+# both and ElementTree refuses the whole document, so rewrite them first:
+# named HTML entities become numeric references, any other "&" that does not
+# start a valid reference becomes "&amp;". CDATA sections are literal text and
+# are left alone.
+_XML_ENTITIES = {"amp", "lt", "gt", "quot", "apos"}
+XML_AMP_RE = re.compile(
+    rb"(<!\[CDATA\[.*?\]\]>)|&(?:#[0-9]+;|#[xX][0-9a-fA-F]+;|([A-Za-z][A-Za-z0-9]*);)?", re.S
+)
+
+
+def _fix_amp(m: "re.Match[bytes]") -> bytes:
+    if m.group(1) is not None:
+        return m.group(1)
+    ref = m.group(0)
+    if ref == b"&":
+        return b"&amp;"
+    name = m.group(2)
+    if name is None:
+        return ref  # numeric reference
+    name = name.decode("ascii")
+    if name in _XML_ENTITIES:
+        return ref
+    cp = html.entities.name2codepoint.get(name)
+    return b"&#%d;" % cp if cp is not None else b"&amp;" + ref[1:]
+
+
+def fix_xml_entities(body: bytes) -> bytes:
+    if b"&" not in body:
+        return body
+    return XML_AMP_RE.sub(_fix_amp, body)
+
+
+XML_DECL_ENCODING_RE = re.compile(rb"\s*<\?xml[^>]*?\sencoding\s*=")
+CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_BOMS = (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
 
 
-def parse_rss(feed: FeedDef, max_items: int) -> List[Dict[str, Any]]:
-    parsed = feedparser.parse(feed.url)
-    out: List[Dict[str, Any]] = []
-    for e in parsed.entries[:max_items]:
-        link = canonicalize_url(getattr(e, "link", "") or "")
+def xml_charset(body: bytes, content_type: Optional[str]) -> Optional[str]:
+    """
+    The charset from a Content-Type header, for documents that do not declare
+    their own encoding (BOM or XML declaration). Without it the parser assumes
+    UTF-8 and a GBK feed (xinhuanet, stats.gov.cn) silently turns to mojibake.
+    """
+    if body.startswith(_BOMS) or XML_DECL_ENCODING_RE.match(body, 0, 512):
+        return None
+    m = CHARSET_RE.search(content_type or "")
+    if not m:
+        return None
+    try:
+        # Python's canonical name, spelled the way libxml2/iconv expects.
+        name = codecs.lookup(m.group(1)).name.replace("_", "-")
+    except LookupError:
+        return None
+    return None if name == "utf-8" else name
+
+
+def iter_elements(
+    source: Any, tags: Tuple[str, ...], encoding: Optional[str] = None
+) -> Iterator[Any]:
+    """
+    Stream-parse XML from a file-like `source`, yielding each element in `tags`
+    once it is complete. Elements are cleared and detached from the tree after
+    the caller is done with them, so memory stays flat no matter how large the
+    document is. `encoding` overrides detection, for documents that do not
+    declare one.
+    """
+    if LET is not None:
+        for _ev, el in LET.iterparse(source, events=("end",), tag=tags, recover=True, encoding=encoding):
+            yield el
+            el.clear(keep_tail=False)
+            while el.getprevious() is not None:
+                del el.getparent()[0]
+        return
+    if encoding:
+        # expat only knows single-byte encodings besides UTF-8/16.
+        source = io.BytesIO(source.read().decode(encoding, errors="replace").encode("utf-8"))
+    # ElementTree has no getparent(); keep the open-element stack ourselves.
+    stack: List[Any] = []
+    for ev, el in ET.iterparse(source, events=("start", "end")):
+        if ev == "start":
+            stack.append(el)
+            continue
+        stack.pop()
+        if el.tag in tags:
+            yield el
+            el.clear()
+            if stack:
+                stack[-1].remove(el)
+
+
+def _find_first_text(node: Any, paths: Iterable[str]) -> str:
+    for path in paths:
+        val = node.findtext(path, namespaces=FEED_NS)
+        if val and val.strip():
+            return val.strip()
+    return ""
+
+
+def _resolve_link(el: Any, href: str, base_url: str) -> str:
+    # xml:base (lxml only; ElementTree does not track it) wins over the feed
+    # URL, and may itself be relative to it.
+    base = getattr(el, "base", None)
+    return urljoin(urljoin(base_url, base) if base else base_url, href)
+
+
+def _entry_link(node: Any, base_url: str) -> str:
+    for path in ("link", "rss1:link"):
+        el = node.find(path, FEED_NS)
+        if el is not None and el.text and el.text.strip():
+            return _resolve_link(el, el.text.strip(), base_url)
+    # Atom: <link rel="alternate" href="..."/> (rel defaults to alternate).
+    for el in node.findall("atom:link", FEED_NS):
+        if el.get("rel", "alternate") == "alternate" and el.get("href"):
+            return _resolve_link(el, el.get("href").strip(), base_url)
+    return ""
+
+
+@contextmanager
+def fetch_raw(
+    url: str, timeout: int = 20, headers: Optional[Dict[str, str]] = None
+) -> Iterator[requests.Response]:
+    """
+    Streaming GET: callers can parse `r.raw` while it downloads instead of
+    holding the body as one bytes/str blob. decode_content makes urllib3 undo
+    gzip/deflate on the fly.
+    """
+    with SESSION.get(url, timeout=timeout, stream=True, headers=headers) as r:
+        r.raise_for_status()
+        r.raw.decode_content = True
+        yield r
+
+
+def load_http_cache() -> None:
+    HTTP_CACHE.clear()
+    try:
+        HTTP_CACHE.update(orjson.loads(HTTP_CACHE_FILE.read_bytes()))
+    except (OSError, ValueError):
+        pass
+
+
+def save_http_cache() -> None:
+    HTTP_CACHE_FILE.write_bytes(orjson.dumps(HTTP_CACHE, option=orjson.OPT_INDENT_2))
+    # Drop parse snapshots no url points at any more (superseded bodies).
+    live = {entry["parsed_cache_path"] for entry in HTTP_CACHE.values()}
+    if PARSE_CACHE_DIR.is_dir():
+        for path in PARSE_CACHE_DIR.iterdir():
+            if path.relative_to(DATA_DIR).as_posix() not in live:
+                path.unlink(missing_ok=True)
+
+
+def _conditional_headers(url: str, max_items: int) -> Dict[str, str]:
+    entry = HTTP_CACHE.get(url)
+    # Without the parsed entries a 304 would leave us with nothing to return,
+    # and a snapshot cut at a different max_items is the wrong answer.
+    if (
+        not entry
+        or entry.get("max_items") != max_items
+        or entry.get("version") != PARSE_CACHE_VERSION
+        or not (DATA_DIR / entry["parsed_cache_path"]).exists()
+    ):
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _parse_cache_path(url: str, max_items: int, encoding: Optional[str], body: bytes) -> Path:
+    # Keyed on the body itself, so servers that send no validators (or rotate
+    # ETags across CDN nodes) still skip the parse when nothing changed.
+    h = hashlib.blake2b(digest_size=16)
+    key = f"{PARSE_CACHE_VERSION}|{url}|{max_items}|{encoding or ''}|"
+    h.update(key.encode("utf-8", errors="ignore"))
+    h.update(hashlib.sha1(body).digest())
+    return PARSE_CACHE_DIR / (h.hexdigest() + ".json")
+
+
+def _load_parsed_cache(feed: FeedDef, path: Path) -> Optional[List[Item]]:
+    # A missing or unreadable snapshot (killed run, older format) is a cache
+    # miss, never a feed failure.
+    try:
+        entries = msgspec.json.decode(path.read_bytes(), type=List[ParsedEntry])
+    except (OSError, msgspec.DecodeError):
+        return None
+    return [feed_item(feed, e, parse_date(e.published)) for e in entries]
+
+
+def _store_parsed_cache(path: Path, items: List[Item]) -> None:
+    entries = [ParsedEntry(it.title, it.link, it.published, it.summary) for it in items]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Same write-then-rename as write_json_array; per-thread name because two
+    # feeds.json entries may share a url.
+    tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(msgspec.json.encode(entries))
+    os.replace(tmp, path)
+
+
+def parse_rss(feed: FeedDef, max_items: int) -> List[Item]:
+    """
+    Handles RSS 2.0, RSS 1.0 (RDF) and Atom by streaming over <item>/<entry>
+    elements instead of building the whole document.
+
+    Parse results are cached: a 304 Not Modified (ETag / Last-Modified from the
+    previous run) or a body identical to one already parsed returns the cached
+    items without running the XML parser.
+    """
+    headers = _conditional_headers(feed.url, max_items)
+    with fetch_raw(feed.url, headers=headers) as r:
+        not_modified = r.status_code == 304 and bool(headers)
+        if not not_modified:
+            # Read whole (feeds are small) so the body hash is known up front.
+            body = r.raw.read()
+            etag = r.headers.get("ETag")
+            last_modified = r.headers.get("Last-Modified")
+            encoding = xml_charset(body, r.headers.get("Content-Type"))
+
+    if not_modified:
+        out = _load_parsed_cache(feed, DATA_DIR / HTTP_CACHE[feed.url]["parsed_cache_path"])
+        if out is not None:
+            return out
+        # The snapshot behind this 304 is unreadable; forget the validators
+        # so the retry fetches the full body instead of another 304.
+        HTTP_CACHE.pop(feed.url, None)
+        return parse_rss(feed, max_items)
+
+    path = _parse_cache_path(feed.url, max_items, encoding, body)
+    out = _load_parsed_cache(feed, path)
+    if out is None:
+        out = _parse_feed_entries(feed, io.BytesIO(fix_xml_entities(body)), max_items, encoding)
+        _store_parsed_cache(path, out)
+    HTTP_CACHE[feed.url] = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "max_items": max_items,
+        "version": PARSE_CACHE_VERSION,
+        "parsed_cache_path": path.relative_to(DATA_DIR).as_posix(),
+    }
+    return out
+
+
+def _parse_feed_entries(
+    feed: FeedDef, source: Any, max_items: int, encoding: Optional[str] = None
+) -> List[Item]:
+    out: List[Item] = []
+    for e in iter_elements(source, FEED_ENTRY_TAGS, encoding):
+        link = canonicalize_url(_entry_link(e, feed.url))
         if not link:
             continue
-        title = getattr(e, "title", "") or ""
-        dt = parse_date(e)
-        summary = ""
-        for k in ("summary", "description", "subtitle"):
-            if hasattr(e, k) and getattr(e, k):
-                summary = getattr(e, k)
-                break
-            if isinstance(e, dict) and e.get(k):
-                summary = e.get(k)
-                break
+        title = _find_first_text(e, ("title", "atom:title", "rss1:title"))
+        dt = parse_date(
+            _find_first_text(e, ("pubDate", "atom:published")),
+            _find_first_text(e, ("atom:updated", "dc:date")),
+        )
+        summary = _find_first_text(
+            e, ("description", "atom:summary", "rss1:description", "content:encoded", "atom:content")
+        )
         summary = clean_html(summary)
 
-        out.append(
-            {
-                "id": sha1(feed.id + "|" + link),
-                "title": clean_html(title),
-                "link": link,
-                "published": (dt.isoformat() if dt else None),
-                "source_id": feed.id,
-                "source": feed.name,
-                "region": feed.region,
-                "lang": feed.lang,
-                "tags": feed.tags,
-                "weight": feed.weight,
-                "summary": summary[:600],
-            }
+        entry = ParsedEntry(
+            title=clean_text(title),
+            link=link,
+            published=(dt.isoformat() if dt else None),
+            summary=summary[:600],
         )
+        out.append(feed_item(feed, entry, dt))
+        if len(out) >= max_items:
+            break
     return out
 
 
-def _et_find_text(node: ET.Element, path: str, ns: Dict[str, str]) -> Optional[str]:
+SITEMAP_NS = {
+    "sm": "http://www.sitemaps.org/schemas/sitemap/0.9",
+    "news": "http://www.google.com/schemas/sitemap-news/0.9",
+}
+
+
+def _et_find_text(node: Any, path: str, ns: Dict[str, str]) -> Optional[str]:
     el = node.find(path, ns)
     return el.text.strip() if (el is not None and el.text) else None
 
 
-def parse_reuters_news_sitemap_index(feed: FeedDef, max_items: int) -> List[Dict[str, Any]]:
+def parse_reuters_news_sitemap_index(feed: FeedDef, max_items: int) -> List[Item]:
     """
     Reuters exposes sitemaps in robots.txt. We use the news-sitemap-index and
     then pull a few most-recent child sitemaps, extracting <news:title> and
     <news:publication_date>.
     """
-    xml = fetch_text(feed.url)
-    ns = {
-        "sm": "http://www.sitemaps.org/schemas/sitemap/0.9",
-        "news": "http://www.google.com/schemas/sitemap-news/0.9",
-    }
-    root = ET.fromstring(xml)
+    ns = SITEMAP_NS
     sitemaps = []
-    for sm in root.findall("sm:sitemap", ns):
-        loc = _et_find_text(sm, "sm:loc", ns)
-        lastmod = _et_find_text(sm, "sm:lastmod", ns)
-        if not loc:
-            continue
-        try:
-            lm = dateparser.parse(lastmod) if lastmod else None
-            if lm and lm.tzinfo is None:
-                lm = lm.replace(tzinfo=timezone.utc)
-        except Exception:
-            lm = None
-        sitemaps.append((loc, lm))
+    with fetch_raw(feed.url) as r:
+        for sm in iter_elements(r.raw, ("{%s}sitemap" % ns["sm"],)):
+            loc = _et_find_text(sm, "sm:loc", ns)
+            lastmod = _et_find_text(sm, "sm:lastmod", ns)
+            if not loc:
+                continue
+            lm = parse_date(lastmod)
+            sitemaps.append((loc, lm))
     # Most recent first
-    sitemaps.sort(key=lambda x: x[1] or datetime(1970, 1, 1, tzinfo=timezone.utc), reverse=True)
+    sitemaps.sort(key=lambda x: x[1] or EPOCH, reverse=True)
 
-    out: List[Dict[str, Any]] = []
+    out: List[Item] = []
     # Fetch a few most recent sitemaps (avoid hammering).
     for loc, _lm in sitemaps[:6]:
         try:
-            child_xml = fetch_text(loc, timeout=25)
-            child_root = ET.fromstring(child_xml)
-            for url_node in child_root.findall("sm:url", ns):
-                link = _et_find_text(url_node, "sm:loc", ns)
-                title = _et_find_text(url_node, "news:news/news:title", ns)
-                pub = _et_find_text(url_node, "news:news/news:publication_date", ns)
-                if not link or not title:
-                    continue
-                dt = None
-                if pub:
-                    try:
-                        dt = dateparser.parse(pub)
-                        if dt.tzinfo is None:
-                            dt = dt.replace(tzinfo=timezone.utc)
-                        dt = dt.astimezone(timezone.utc)
-                    except Exception:
-                        dt = None
-                out.append(
-                    {
-                        "id": sha1(feed.id + "|" + link),
-                        "title": title.strip(),
-                        "link": canonicalize_url(link.strip()),
-                        "published": (dt.isoformat() if dt else None),
-                        "source_id": feed.id,
-                        "source": feed.name,
-                        "region": feed.region,
-                        "lang": feed.lang,
-                        "tags": list(set(feed.tags + ["Reuters"])),
-                        "weight": feed.weight,
-                        "summary": "",
-                    }
-                )
-                if len(out) >= max_items:
-                    break
+            with fetch_raw(loc, timeout=25) as r:
+                for url_node in iter_elements(r.raw, ("{%s}url" % ns["sm"],)):
+                    link = _et_find_text(url_node, "sm:loc", ns)
+                    title = _et_find_text(url_node, "news:news/news:title", ns)
+                    pub = _et_find_text(url_node, "news:news/news:publication_date", ns)
+                    if not link or not title:
+                        continue
+                    dt = parse_date(pub)
+                    it = Item(
+                        id=itemid(feed.id, link),
+                        title=title.strip(),
+                        link=canonicalize_url(link),
+                        published=(dt.isoformat() if dt else None),
+                        source_id=feed.id,
+                        source=feed.name,
+                        region=feed.region,
+                        lang=feed.lang,
+                        tags=list(set(feed.tags + ["Reuters"])),
+                        weight=feed.weight,
+                        summary="",
+                    )
+                    out.append(with_build_fields(it, dt))
+                    if len(out) >= max_items:
+                        break
             if len(out) >= max_items:
                 break
         except Exception:
@@ -254,30 +720,26 @@ def parse_reuters_news_sitemap_index(feed: FeedDef, max_items: int) -> List[Dict
     return out
 
 
-def filter_by_age(items: List[Dict[str, Any]], max_age_days: int) -> List[Dict[str, Any]]:
+def fetch_feed(feed: FeedDef, max_items: int) -> List[Item]:
+    # Runs inside the fetch pool in main(); one call per feed.
+    if feed.type == "rss":
+        return parse_rss(feed, max_items)
+    if feed.type == "reuters_news_sitemap_index":
+        return parse_reuters_news_sitemap_index(feed, max_items)
+    return []
+
+
+def filter_by_age(items: List[Item], max_age_days: int) -> List[Item]:
     cutoff = now_utc() - timedelta(days=max_age_days)
-    out = []
-    for it in items:
-        p = it.get("published")
-        if not p:
-            out.append(it)
-            continue
-        try:
-            dt = dateparser.parse(p)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            if dt >= cutoff:
-                out.append(it)
-        except Exception:
-            out.append(it)
-    return out
+    return [it for it in items if it._dt is None or it._dt >= cutoff]
 
 
-def dedupe(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def dedupe(items: List[Item]) -> List[Item]:
     seen = set()
     out = []
     for it in items:
-        key = (canonicalize_url(it["link"]), re.sub(r"\s+", " ", it["title"]).strip().lower())
+        # Both parts are computed once at ingest, next to the canonical link.
+        key = (it._url_key, it._title_norm)
         if key in seen:
             continue
         seen.add(key)
@@ -289,70 +751,104 @@ WORD_RE = re.compile(r"[A-Za-z0-9\u4e00-\u9fff]+")
 
 
 def tokenize(title: str) -> List[str]:
-    t = title.lower()
-    toks = WORD_RE.findall(t)
+    # Tokens are interned: repeated words across titles share one str object,
+    # so the set/dict lookups in clustering hit the identity fast path.
     # drop very short tokens
-    return [x for x in toks if len(x) >= 2]
+    return [sys.intern(x) for x in WORD_RE.findall(title.lower()) if len(x) >= 2]
 
 
-def jaccard(a: Iterable[str], b: Iterable[str]) -> float:
-    sa, sb = set(a), set(b)
-    if not sa or not sb:
-        return 0.0
-    inter = len(sa & sb)
-    union = len(sa | sb)
-    return inter / union if union else 0.0
+TOPIC_JACCARD = 0.55
 
 
-def build_topics(items: List[Dict[str, Any]], top_k: int = 10) -> List[Dict[str, Any]]:
+def cluster_labels(token_sets: List[frozenset]) -> np.ndarray:
     """
-    Simple clustering by title token Jaccard similarity.
+    Connected components of the graph linking titles whose token Jaccard is
+    >= TOPIC_JACCARD.
+
+    Candidate pairs come from an inverted index over each title's prefix:
+    with tokens ordered rarest first, two sets with Jaccard >= t must share
+    at least one of their first |s| - ceil(t * |s|) + 1 tokens. Common words
+    ("the", "to", ...) therefore never produce candidates on their own, and
+    exact intersections are computed only for the pairs that survive.
     """
-    clusters: List[Dict[str, Any]] = []
-    for it in items:
-        toks = tokenize(it["title"])
-        assigned = False
-        for c in clusters:
-            if jaccard(toks, c["tokens"]) >= 0.55:
-                c["items"].append(it["id"])
-                c["sources"].add(it["source"])
-                c["max_weight"] = max(c["max_weight"], float(it.get("weight", 1.0)))
-                # keep the most informative headline (longer tends to be better)
-                if len(it["title"]) > len(c["headline"]):
-                    c["headline"] = it["title"]
-                    c["tokens"] = toks
-                assigned = True
-                break
-        if not assigned:
-            clusters.append(
-                {
-                    "id": sha1("topic|" + it["title"])[:12],
-                    "headline": it["title"],
-                    "tokens": toks,
-                    "items": [it["id"]],
-                    "sources": {it["source"]},
-                    "max_weight": float(it.get("weight", 1.0)),
-                }
-            )
+    n = len(token_sets)
+    df = Counter(t for ts in token_sets for t in ts)
+    vocab = {t: i for i, t in enumerate(sorted(df, key=lambda t: (df[t], t)))}
+    indices: List[int] = []
+    indptr = [0]
+    prefix_indices: List[int] = []
+    prefix_indptr = [0]
+    for ts in token_sets:
+        ids = sorted(vocab[t] for t in ts)
+        indices.extend(ids)
+        indptr.append(len(indices))
+        # The epsilon guards ceil() against float error (0.55 * 20 > 11).
+        keep = len(ids) - math.ceil(TOPIC_JACCARD * len(ids) - 1e-9) + 1
+        prefix_indices.extend(ids[:keep])
+        prefix_indptr.append(len(prefix_indices))
+
+    def binary_csr(idx: List[int], ptr: List[int]) -> csr_matrix:
+        return csr_matrix(
+            (np.ones(len(idx), dtype=np.int32), np.asarray(idx, dtype=np.int32), np.asarray(ptr)),
+            shape=(n, len(vocab)),
+        )
+
+    m = binary_csr(indices, indptr)
+    prefixes = binary_csr(prefix_indices, prefix_indptr)
+    # Upper triangle only: the product is symmetric and the diagonal is each
+    # title matched with itself.
+    cand = triu(prefixes @ prefixes.T, k=1).tocoo()
+    rows, cols = cand.row, cand.col
+    inter = np.asarray(m[rows].multiply(m[cols]).sum(axis=1)).ravel()
+    sizes = np.diff(m.indptr)
+    union = sizes[rows] + sizes[cols] - inter
+    linked = inter >= TOPIC_JACCARD * union
+    adj = coo_matrix(
+        (np.ones(int(linked.sum()), dtype=np.int8), (rows[linked], cols[linked])),
+        shape=(n, n),
+    )
+    _n, labels = connected_components(adj, directed=False)
+    return labels
+
+
+def build_topics(items: List[Item], top_k: int = 10) -> List[Topic]:
+    """
+    Simple clustering by title token Jaccard similarity (single linkage).
+    """
+    if not items:
+        return []
+    labels = cluster_labels([frozenset(tokenize(it.title)) for it in items])
+    by_label: Dict[int, Dict[str, Any]] = {}
+    for it, label in zip(items, labels.tolist()):
+        c = by_label.get(label)
+        if c is None:
+            by_label[label] = {
+                "id": sha1("topic|" + it.title)[:12],
+                "headline": it.title,
+                "items": [it.id],
+                "sources": {it.source},
+                "max_weight": float(it.weight),
+            }
+            continue
+        c["items"].append(it.id)
+        c["sources"].add(it.source)
+        c["max_weight"] = max(c["max_weight"], float(it.weight))
+        # keep the most informative headline (longer tends to be better)
+        if len(it.title) > len(c["headline"]):
+            c["headline"] = it.title
+    clusters = list(by_label.values())
 
     # score clusters: count * source_diversity * recency
-    id_to_item = {it["id"]: it for it in items}
+    id_to_item = {it.id: it for it in items}
     def cluster_score(c: Dict[str, Any]) -> float:
         count = len(c["items"])
         diversity = len(c["sources"])
         # recency: newest item age
         newest = None
         for iid in c["items"]:
-            p = id_to_item.get(iid, {}).get("published")
-            if not p:
-                continue
-            try:
-                dt = dateparser.parse(p)
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                newest = max(newest, dt) if newest else dt
-            except Exception:
-                continue
+            dt = id_to_item[iid]._dt
+            if dt and (newest is None or dt > newest):
+                newest = dt
         if newest:
             age_h = max(0.0, (now_utc() - newest).total_seconds() / 3600.0)
             recency = 1.0 / (1.0 + age_h / 12.0)  # half-life-ish
@@ -367,72 +863,74 @@ def build_topics(items: List[Dict[str, Any]], top_k: int = 10) -> List[Dict[str,
     out = []
     for c in clusters[:top_k]:
         out.append(
-            {
-                "id": c["id"],
-                "headline": c["headline"],
-                "count": len(c["items"]),
-                "sources": sorted(list(c["sources"]))[:10],
-                "items": c["items"][:10],
-                "score": round(float(c["score"]), 4),
-            }
+            Topic(
+                id=c["id"],
+                headline=c["headline"],
+                count=len(c["items"]),
+                sources=sorted(list(c["sources"]))[:10],
+                items=c["items"][:10],
+                score=round(float(c["score"]), 4),
+            )
         )
     return out
 
 
 def main() -> int:
     cfg, feeds = load_feeds()
+    load_http_cache()
     defaults = cfg.get("defaults", {})
     max_age_days = int(defaults.get("max_age_days", 7))
     max_items_per_feed = int(defaults.get("max_items_per_feed", 40))
 
-    all_items: List[Dict[str, Any]] = []
+    all_items: List[Item] = []
     failures: List[Dict[str, str]] = []
 
-    for f in feeds:
-        try:
-            if f.type == "rss":
-                items = parse_rss(f, max_items_per_feed)
-            elif f.type == "reuters_news_sitemap_index":
-                items = parse_reuters_news_sitemap_index(f, max_items_per_feed)
-            else:
-                items = []
-            all_items.extend(items)
-        except Exception as e:
-            failures.append({"feed": f.id, "url": f.url, "error": str(e)})
+    # Submit in shuffled order so feeds sharing a host (e.g. xinhuanet,
+    # sec.gov) are spread across the pool instead of hitting the same server
+    # back to back, but collect results in feeds.json order: dedupe keeps the
+    # first copy and the sort is stable, so arrival order would otherwise leak
+    # into the output and churn data/*.json between identical runs.
+    order = list(range(len(feeds)))
+    random.shuffle(order)
+    results: List[Any] = [None] * len(feeds)
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as ex:
+        futures = {ex.submit(fetch_feed, feeds[i], max_items_per_feed): i for i in order}
+        for fut in as_completed(futures):
+            i = futures[fut]
+            try:
+                results[i] = fut.result()
+            except Exception as e:
+                results[i] = e
+    for f, res in zip(feeds, results):
+        if isinstance(res, Exception):
+            failures.append({"feed": f.id, "url": f.url, "error": str(res)})
+        else:
+            all_items.extend(res)
 
     all_items = filter_by_age(all_items, max_age_days)
     all_items = dedupe(all_items)
 
     # Sort: published desc then weight.
-    def sort_key(it: Dict[str, Any]):
-        p = it.get("published")
-        try:
-            dt = dateparser.parse(p) if p else datetime(1970, 1, 1, tzinfo=timezone.utc)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-        except Exception:
-            dt = datetime(1970, 1, 1, tzinfo=timezone.utc)
-        return (dt, float(it.get("weight", 1.0)))
-
-    all_items.sort(key=sort_key, reverse=True)
+    for it in all_items:
+        it._sortkey = (it._dt or EPOCH, float(it.weight))
+    all_items.sort(key=attrgetter("_sortkey"), reverse=True)
 
     topics = build_topics(all_items, top_k=10)
 
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    (DATA_DIR / "items.json").write_text(json.dumps(all_items, ensure_ascii=False, indent=2), encoding="utf-8")
-    (DATA_DIR / "topics.json").write_text(json.dumps(topics, ensure_ascii=False, indent=2), encoding="utf-8")
-    (DATA_DIR / "meta.json").write_text(
-        json.dumps(
+    save_http_cache()
+    write_json_array(DATA_DIR / "items.json", all_items)
+    write_json_array(DATA_DIR / "topics.json", topics)
+    (DATA_DIR / "meta.json").write_bytes(
+        orjson.dumps(
             {
                 "generated_at": now_utc().isoformat(),
                 "count_items": len(all_items),
                 "count_topics": len(topics),
                 "failures": failures,
             },
-            ensure_ascii=False,
-            indent=2,
-        ),
-        encoding="utf-8",
+            option=orjson.OPT_INDENT_2,
+        )
     )
 
     print(f"Generated: {len(all_items)} items, {len(topics)} topics. Failures: {len(failures)}")
@@ -0,0 +1,79 @@
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import build  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+FEED = build.FeedDef(
+    id="ex",
+    name="Example",
+    url="https://example.com/feed.xml",
+    type="rss",
+    region="Global",
+    lang="en",
+    tags=[],
+    weight=1.0,
+)
+
+
+@pytest.fixture(params=["lxml", "etree"])
+def parser(request, monkeypatch):
+    if request.param == "etree":
+        monkeypatch.setattr(build, "LET", None)
+    elif build.LET is None:
+        pytest.skip("lxml not installed")
+
+
+def parse_fixture(name):
+    body = (FIXTURES / name).read_bytes()
+    return build._parse_feed_entries(FEED, io.BytesIO(build.fix_xml_entities(body)), 10)
+
+
+def test_bare_ampersand_in_title_and_link(parser):
+    (it,) = parse_fixture("bare_ampersand.xml")
+    assert it.title == "S&P 500 falls as M&A deals slow — again"
+    assert it.link == "https://example.com/news/1?a=1&b=2"
+    assert it.summary == "Q&A inside CDATA"
+
+
+def test_charset_from_content_type_when_undeclared(parser):
+    body = (
+        '<?xml version="1.0"?><rss><channel><item>'
+        "<title>新华社消息</title><link>https://example.com/1</link>"
+        "</item></channel></rss>"
+    ).encode("gbk")
+    encoding = build.xml_charset(body, "application/rss+xml; charset=GBK")
+    (it,) = build._parse_feed_entries(FEED, io.BytesIO(body), 10, encoding)
+    assert it.title == "新华社消息"
+
+
+def test_declared_encoding_wins_over_content_type():
+    body = '<?xml version="1.0" encoding="utf-8"?><rss/>'.encode()
+    assert build.xml_charset(body, "text/xml; charset=GBK") is None
+
+
+def test_markup_words_in_title_are_kept(parser):
+    body = (
+        b"<rss><channel><item>"
+        b"<title>How to use &lt;script&gt; tags safely</title>"
+        b"<link>https://example.com/2</link>"
+        b"</item></channel></rss>"
+    )
+    (it,) = build._parse_feed_entries(FEED, io.BytesIO(body), 10)
+    assert it.title == "How to use tags safely"
+
+
+def test_unreadable_snapshot_is_a_cache_miss(tmp_path):
+    path = tmp_path / "snap.json"
+    items = parse_fixture("bare_ampersand.xml")
+    build._store_parsed_cache(path, items)
+    assert [it.link for it in build._load_parsed_cache(FEED, path)] == [it.link for it in items]
+    assert list(tmp_path.iterdir()) == [path]
+    path.write_bytes(path.read_bytes()[:10])
+    assert build._load_parsed_cache(FEED, path) is None
+    assert build._load_parsed_cache(FEED, tmp_path / "missing.json") is None